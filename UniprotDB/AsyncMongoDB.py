@@ -1,6 +1,6 @@
 import asyncio
 import itertools
-from typing import Callable, Generator, List, Tuple, BinaryIO, Union
+from typing import Callable, Generator, Iterable, List, Tuple, BinaryIO, Union
 
 import motor.motor_asyncio
 import pymongo
@@ -18,6 +18,8 @@ class MongoDatabase(BaseDatabase):
         self.loop = asyncio.get_event_loop()
         self.client = motor.motor_asyncio.AsyncIOMotorClient(*host)
         self.col = self.client[database].proteins
+        self.metadata = self.client[database].metadata
+        self._load_compression()
 
     def get_item(self, item: str) -> Union[SeqRecord, None]:
         t = self.loop.run_until_complete(self.col.find_one({'$or': [{i: item} for i in self.ids]}))
@@ -26,6 +28,28 @@ class MongoDatabase(BaseDatabase):
         r = self._extract_seqrecord(t['raw_record'])
         return r
 
+    def get_raw(self, item: str) -> Union[bytes, None]:
+        t = self.loop.run_until_complete(self.col.find_one({'$or': [{i: item} for i in self.ids]},
+                                                            {'raw_record': True}))
+        if t is None:
+            return None
+        return self.decompressor.decompress(t['raw_record'])
+
+    def get_many(self, items: Iterable[str], batch_size: int = 1000) -> List[Union[SeqRecord, None]]:
+        return self.loop.run_until_complete(self._get_many(items, batch_size))
+
+    async def _get_many(self, items: Iterable[str], batch_size: int = 1000) -> List[Union[SeqRecord, None]]:
+        items = list(items)
+        found = {}
+        unique = list(set(items))
+        projection = {i: True for i in self.ids + ['raw_record']}
+        for start in range(0, len(unique), batch_size):
+            batch = unique[start:start + batch_size]
+            query = {'$or': [{i: {'$in': batch}} for i in self.ids]}
+            async for entry in self.col.find(query, projection):
+                self._match_ids(entry, set(batch), found)
+        return [self._extract_seqrecord(found[item]['raw_record']) if item in found else None for item in items]
+
     def get_iter(self) -> Generator[SeqRecord, None, None]:
         q = asyncio.Queue()
         self.loop.create_task(self._get_iter(q))
@@ -39,6 +63,49 @@ class MongoDatabase(BaseDatabase):
             await q.put(self._extract_seqrecord(entry['raw_record']))
         await q.put(None)
 
+    def iter_raw(self) -> Generator[bytes, None, None]:
+        q = asyncio.Queue()
+        self.loop.create_task(self._iter_raw(q))
+        r = self.loop.run_until_complete(q.get())
+        while r:
+            yield r
+            r = self.loop.run_until_complete(q.get())
+
+    async def _iter_raw(self, q: asyncio.Queue) -> None:
+        async for entry in self.col.find({'_id': {'$exists': True}}, {'raw_record': 1}):
+            await q.put(self.decompressor.decompress(entry['raw_record']))
+        await q.put(None)
+
+    def partitions(self, n: int = 16) -> List[Tuple[Union[str, None], Union[str, None]]]:
+        buckets = self.loop.run_until_complete(
+            self.col.aggregate([{'$bucketAuto': {'groupBy': '$_id', 'buckets': n}}]).to_list(None)
+        )
+        bounds = [None] + [b['_id']['max'] for b in buckets[:-1]] + [None]
+        return list(zip(bounds[:-1], bounds[1:]))
+
+    def _partition_query(self, partition: Tuple[Union[str, None], Union[str, None]]) -> dict:
+        lower, upper = partition
+        query = {}
+        if lower is not None:
+            query['$gte'] = lower
+        if upper is not None:
+            query['$lt'] = upper
+        return {'_id': query} if query else {'_id': {'$exists': True}}
+
+    def _iter_partition(self, partition: Tuple[Union[str, None], Union[str, None]]) -> Generator[bytes, None, None]:
+        q = asyncio.Queue()
+        self.loop.create_task(self._iter_partition_async(partition, q))
+        r = self.loop.run_until_complete(q.get())
+        while r:
+            yield r
+            r = self.loop.run_until_complete(q.get())
+
+    async def _iter_partition_async(self, partition: Tuple[Union[str, None], Union[str, None]],
+                                    q: asyncio.Queue) -> None:
+        async for entry in self.col.find(self._partition_query(partition), {'raw_record': 1}):
+            await q.put(entry['raw_record'])
+        await q.put(None)
+
     def get_iterkeys(self) -> Generator[str, None, None]:
         q = asyncio.Queue()
         self.loop.create_task(self._get_iterkeys(q))
@@ -70,6 +137,7 @@ class MongoDatabase(BaseDatabase):
 
     def _reset(self) -> None:
         self.loop.run_until_complete(self.client[self.database].proteins.drop())
+        self.loop.run_until_complete(self.metadata.delete_one({'_id': 'compression'}))
 
     def _create_indices(self, background: bool = False) -> None:
         for field in self.indices:
@@ -77,6 +145,18 @@ class MongoDatabase(BaseDatabase):
                 self.client[self.database].proteins.create_index([(field, pymongo.ASCENDING)],
                                                                  background=background, sparse=True))
 
+    def _fetch_compression(self) -> Union[Tuple[Union[bytes, None], int], None]:
+        info = self.loop.run_until_complete(self.metadata.find_one({'_id': 'compression'}))
+        if info is None:
+            return None
+        return info['dict'], info['level']
+
+    def _store_compression(self, dict_data: Union[bytes, None], level: int) -> None:
+        self.loop.run_until_complete(
+            self.metadata.replace_one({'_id': 'compression'}, {'_id': 'compression', 'dict': dict_data, 'level': level},
+                                      upsert=True)
+        )
+
     def update(self, handles: List[BinaryIO], filter_fn: Callable = None,
                loud: bool = False, total: int = None, workers: int = 1) -> None:
         self.loop.run_until_complete(
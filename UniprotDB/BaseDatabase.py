@@ -1,11 +1,14 @@
+import itertools
 import sys
 from abc import ABC, abstractmethod
 from functools import partial
-from typing import Union, Callable, Iterable, Generator, List
+from typing import Union, Callable, Iterable, Generator, List, Set, Dict, Tuple
 
 import zstd
 from Bio.SeqRecord import SeqRecord
 
+from UniprotDB.SwissProtUtils import parse_raw_swiss
+
 
 class BaseDatabase(ABC):
     ids = ['_id', 'RefSeq', 'STRING', 'GeneID', 'PIR', 'Uni_name', 'seq_sha1']
@@ -16,33 +19,81 @@ class BaseDatabase(ABC):
     def __init__(self, database: str, host: Union[tuple, str],
                  compressor: zstd.ZstdCompressor = None,
                  decompressor: zstd.ZstdDecompressor = None,
-                 create_protein_func: Callable = None):
+                 create_protein_func: Callable = None,
+                 lazy: bool = False):
         self.database = database
         self.host = host
-        if not compressor:
-            self.compressor = zstd.ZstdCompressor()
-        if not decompressor:
-            self.decompressor = zstd.ZstdDecompressor()
+        self.lazy = lazy
         if not create_protein_func:
-            from UniprotDB._utils import _create_protein_swiss
-            self.create_protein_func = partial(_create_protein_swiss, compressor=self.compressor)
+            from UniprotDB._utils import _create_protein_swiss_bytes
+            create_protein_func = _create_protein_swiss_bytes
+        self._base_create_protein_func = create_protein_func
+        self._user_compressor = compressor
+        self._user_decompressor = decompressor
+        self._setup_compression()
+
+    def _setup_compression(self, dict_data: bytes = None, level: int = 3) -> None:
+        """
+        Prepares the compressor and decompressor, using a trained zstd dictionary if one is given
+        """
+        zdict = zstd.ZstdCompressionDict(dict_data) if dict_data else None
+        self.compression_dict = dict_data
+        self.compression_level = level
+        self.compressor = self._user_compressor or zstd.ZstdCompressor(level=level, dict_data=zdict)
+        self.decompressor = self._user_decompressor or zstd.ZstdDecompressor(dict_data=zdict)
+        self.create_protein_func = partial(self._base_create_protein_func, compressor=self.compressor)
+        if self.lazy:
+            from UniprotDB.Records import LazyRecord
+            self._extract_seqrecord = partial(LazyRecord, decompressor=self.decompressor)
         else:
-            self.create_protein_func = partial(create_protein_func, compressor=self.compressor)
-        from UniprotDB._utils import _extract_seqrecord
-        self._extract_seqrecord = partial(_extract_seqrecord, decompressor=self.decompressor)
-        pass
+            from UniprotDB._utils import _extract_seqrecord
+            self._extract_seqrecord = partial(_extract_seqrecord, decompressor=self.decompressor)
+
+    def _load_compression(self) -> None:
+        info = self._fetch_compression()
+        if info:
+            self._setup_compression(*info)
+        else:
+            self._setup_compression()
+
+    def train_compression(self, raw_records: Iterable[bytes],
+                          dict_size: int = 2 ** 17,
+                          level: int = 3) -> None:
+        """
+        Trains a zstd dictionary from a sample of raw SwissProt entries and stores it with the database.
+        Should be done on an empty database, before any entries are added.
+        """
+        samples = list(raw_records)
+        dict_data = zstd.train_dictionary(dict_size, samples, level=level).as_bytes()
+        self._store_compression(dict_data, level)
+        self._setup_compression(dict_data, level)
 
     def initialize(self, seq_handles: Iterable,
                    filter_fn: Callable[[bytes], bool] = None,
                    loud: bool = False,
                    n_seqs: int = None,
-                   workers: int = 1) -> None:
+                   workers: int = 1,
+                   train_dict: bool = False,
+                   dict_samples: int = 10000,
+                   dict_size: int = 2 ** 17,
+                   compression_level: int = 3) -> None:
         if loud:
             print("--initializating database\n", file=sys.stderr)
         self._reset()
+        self._setup_compression(level=compression_level)
+        self._store_compression(None, compression_level)
 
         self._create_indices()
 
+        if train_dict:
+            # Sampling reads ahead in large buffers, so the first handle must be seekable to load it afterwards
+            seq_handles = list(seq_handles)
+            samples = list(itertools.islice(parse_raw_swiss(seq_handles[0], filter_fn), dict_samples))
+            seq_handles[0].seek(0)
+            if loud:
+                print(f"--training compression dictionary on {len(samples)} entries\n", file=sys.stderr)
+            self.train_compression(samples, dict_size=dict_size, level=compression_level)
+
         self.update(seq_handles, filter_fn=filter_fn, loud=loud, total=n_seqs, workers=workers)
 
         if loud:
@@ -52,10 +103,56 @@ class BaseDatabase(ABC):
     def get_item(self, item: str) -> SeqRecord:
         pass
 
+    @abstractmethod
+    def get_raw(self, item: str) -> Union[bytes, None]:
+        pass
+
+    @abstractmethod
+    def iter_raw(self) -> Generator[bytes, None, None]:
+        pass
+
+    def iter_fasta(self) -> Generator[bytes, None, None]:
+        from UniprotDB.Records import raw_to_fasta
+        for raw_record in self.iter_raw():
+            yield raw_to_fasta(raw_record)
+
+    def get_many(self, items: Iterable[str]) -> List[Union[SeqRecord, None]]:
+        return [self.get_item(item) for item in items]
+
+    def _match_ids(self, entry: dict, items: Set[str], found: Dict[str, dict]) -> None:
+        """
+        Records a fetched protein entry under every requested key it matches, preferring primary accessions
+        """
+        for attr in self.ids:
+            values = entry.get(attr, [])
+            if isinstance(values, str):
+                values = [values]
+            for value in values:
+                if value in items and (value not in found or attr == '_id'):
+                    found[value] = entry
+
     @abstractmethod
     def get_iter(self) -> Generator[SeqRecord, None, None]:
         pass
 
+    @abstractmethod
+    def partitions(self) -> List:
+        """
+        Returns picklable descriptions of disjoint parts of the database which together cover every entry.
+        """
+        pass
+
+    @abstractmethod
+    def _iter_partition(self, partition) -> Generator[bytes, None, None]:
+        """
+        Yields the compressed records of one partition.
+        """
+        pass
+
+    def iter_partition(self, partition) -> Generator[SeqRecord, None, None]:
+        for entry in self._iter_partition(partition):
+            yield self._extract_seqrecord(entry)
+
     @abstractmethod
     def get_iterkeys(self) -> Generator[str, None, None]:
         pass
@@ -80,6 +177,14 @@ class BaseDatabase(ABC):
     def _create_indices(self) -> None:
         pass
 
+    @abstractmethod
+    def _fetch_compression(self) -> Union[Tuple[Union[bytes, None], int], None]:
+        pass
+
+    @abstractmethod
+    def _store_compression(self, dict_data: Union[bytes, None], level: int) -> None:
+        pass
+
     @abstractmethod
     def update(self, handles: Iterable,
                filter_fn: Callable[[bytes], bool] = None,
@@ -107,3 +212,7 @@ class BaseDatabase(ABC):
     @abstractmethod
     def add_protein(self, protein: dict) -> None:
         pass
+
+    def add_proteins(self, proteins: Iterable[dict]) -> None:
+        for protein in proteins:
+            self.add_protein(protein)
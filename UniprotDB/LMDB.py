@@ -3,7 +3,8 @@ import itertools
 import json
 import os.path
 import shutil
-from typing import Iterable, Callable, Generator, List, BinaryIO, Union, Dict
+from collections import defaultdict
+from typing import Iterable, Callable, Generator, List, BinaryIO, Union, Dict, Tuple
 
 import lmdb
 from Bio.SeqRecord import SeqRecord
@@ -20,6 +21,7 @@ class RawLMDBDatabase(BaseDatabase):
                  map_size: int = int(2 ** 40),
                  db_splits: int = 10,
                  index_db_splits: int = 10,
+                 batch_size: int = 1000,
                  **kwargs):
         if host.startswith('~'):
             host = os.path.expanduser(host)
@@ -31,6 +33,7 @@ class RawLMDBDatabase(BaseDatabase):
         self.map_size = map_size
         self.db_splits = db_splits
         self.index_db_splits = index_db_splits
+        self.batch_size = batch_size
         super().__init__(database, host, **kwargs)
         self.has_index = index
         self._setup_dbs()
@@ -39,7 +42,27 @@ class RawLMDBDatabase(BaseDatabase):
         splits = self.index_db_splits if attr else self.db_splits
         return str(hashlib.md5(item.encode()).digest()[0] % splits)
 
+    def _index_db(self, subdb: str):
+        """
+        Returns the (cached) dupsort handle for an index environment.
+        """
+        try:
+            return self._index_handles[subdb]
+        except KeyError:
+            pass
+        env = self.index_dbs[subdb]
+        if self.index_subdb or subdb.startswith('alias'):
+            handle = env.open_db(b'index', dupsort=True)
+        else:
+            handle = env.open_db(dupsort=True)
+        self._index_handles[subdb] = handle
+        return handle
+
     def _setup_dbs(self) -> None:
+        # Databases created before this setting existed keep their index entries in the main database,
+        # which newer py-lmdb releases refuse to open with dupsort flags.
+        self.index_subdb = True
+        self.has_alias = True
         try:
             with open(os.path.join(self.host, 'db_info.json'), 'r') as i:
                 db_info = json.load(i)
@@ -59,27 +82,84 @@ class RawLMDBDatabase(BaseDatabase):
                 self.map_size = db_info['map_size']
                 self.db_splits = db_info['db_splits']
                 self.index_db_splits = db_info['index_splits']
+            self.index_subdb = db_info.get('index_subdb', False)
+            self.has_alias = db_info.get('alias_index', False)
         except FileNotFoundError:
             pass
 
         self.db: Dict[str] = {}
         for i in range(self.db_splits):
             self.db[str(i)] = lmdb.open(os.path.join(self.host, str(i) + '.lmdb'),
-                                        map_size=self.map_size / self.db_splits,
+                                        map_size=self.map_size // self.db_splits,
                                         writemap=True, map_async=True, readahead=False)
         if self.has_index:
             self.index_dbs: Dict[str] = {}
+            self._index_handles: Dict[str] = {}
             for index in self.indices:
                 for i in range(self.index_db_splits):
                     self.index_dbs[index + str(i)] = \
                         lmdb.open(os.path.join(self.host, index + str(i) + '.lmdb'),
-                                  map_size=self.map_size / self.index_db_splits,
+                                  map_size=self.map_size // self.index_db_splits,
+                                  max_dbs=1 if self.index_subdb else 0,
                                   writemap=True, map_async=True, readahead=False)
-        with open(os.path.join(self.host, 'db_info.json'), 'w') as o:
-            json.dump({'indexed': self.has_index,
-                       'map_size': self.map_size,
-                       'db_splits': self.db_splits,
-                       'index_splits': self.index_db_splits}, o)
+            if self.has_alias:
+                self._open_alias_dbs()
+        else:
+            self.has_alias = False
+        self._load_compression()
+        self._write_db_info()
+
+    def _open_alias_dbs(self) -> None:
+        for i in range(self.index_db_splits):
+            if 'alias' + str(i) not in self.index_dbs:
+                self.index_dbs['alias' + str(i)] = \
+                    lmdb.open(os.path.join(self.host, 'alias' + str(i) + '.lmdb'),
+                              map_size=self.map_size // self.index_db_splits,
+                              max_dbs=1,
+                              writemap=True, map_async=True, readahead=False)
+
+    def _write_db_info(self) -> None:
+        db_info = {'indexed': self.has_index,
+                   'map_size': self.map_size,
+                   'db_splits': self.db_splits,
+                   'index_splits': self.index_db_splits,
+                   'index_subdb': self.index_subdb,
+                   'alias_index': self.has_alias,
+                   'compression_level': self.compression_level}
+        filename = os.path.join(self.host, 'db_info.json')
+        try:
+            with open(filename, 'r') as i:
+                if json.load(i) == db_info:
+                    return
+        except (FileNotFoundError, ValueError):
+            pass
+        # Many processes open the same database at once, so replace the file atomically
+        with open(filename + f'.{os.getpid()}', 'w') as o:
+            json.dump(db_info, o)
+        os.replace(filename + f'.{os.getpid()}', filename)
+
+    def _fetch_compression(self) -> Union[Tuple[Union[bytes, None], int], None]:
+        try:
+            with open(os.path.join(self.host, 'db_info.json'), 'r') as i:
+                level = json.load(i).get('compression_level', 3)
+        except FileNotFoundError:
+            return None
+        try:
+            with open(os.path.join(self.host, 'zstd_dict'), 'rb') as i:
+                dict_data = i.read()
+        except FileNotFoundError:
+            dict_data = None
+        return dict_data, level
+
+    def _store_compression(self, dict_data: Union[bytes, None], level: int) -> None:
+        dict_file = os.path.join(self.host, 'zstd_dict')
+        if dict_data:
+            with open(dict_file, 'wb') as o:
+                o.write(dict_data)
+        elif os.path.exists(dict_file):
+            os.remove(dict_file)
+        self.compression_level = level
+        self._write_db_info()
 
     def _reset(self) -> None:
         for db in self.db.values():
@@ -98,20 +178,115 @@ class RawLMDBDatabase(BaseDatabase):
         self._setup_dbs()
 
     def get_item(self, item: str) -> Union[SeqRecord, None]:
+        t = self._get_compressed(item)
+        if t is None:
+            return None
+        return self._extract_seqrecord(t)
+
+    def get_raw(self, item: str) -> Union[bytes, None]:
+        t = self._get_compressed(item)
+        if t is None:
+            return None
+        return self.decompressor.decompress(t)
+
+    def _get_compressed(self, item: str) -> Union[bytes, None]:
         with self.db[self._get_subdb(item)].begin() as txn:
             t = txn.get(item.encode())
         if not t and self.has_index:
-            for attr in (a for a in self.ids if a != '_id'):
-                subdb = attr + self._get_subdb(item, True)
+            pid = self._resolve(item)
+            if pid:
+                with self.db[self._get_subdb(pid)].begin() as txn:
+                    t = txn.get(pid.encode())
+        return t
+
+    def _resolve(self, item: str) -> Union[str, None]:
+        """
+        Finds the primary accession for a secondary identifier
+        """
+        if self.has_alias:
+            subdb = 'alias' + self._get_subdb(item, True)
+            db = self._index_db(subdb)
+            with self.index_dbs[subdb].begin() as txn:
+                t = txn.get(item.encode(), db=db)
+            return t.split(b'\t')[2].decode() if t else None
+        for attr in (a for a in self.ids if a != '_id'):
+            subdb = attr + self._get_subdb(item, True)
+            db = self._index_db(subdb)
+            with self.index_dbs[subdb].begin() as txn:
+                t = txn.get(item.encode(), db=db)
+            if t:
+                return t.decode()
+        return None
+
+    def resolve_alias(self, item: str) -> List[Tuple[str, str]]:
+        """
+        Returns every (source attribute, primary accession) pair a secondary identifier maps to
+        """
+        if not self.has_alias:
+            raise ValueError('Database has no alias index, see build_alias_index()')
+        subdb = 'alias' + self._get_subdb(item, True)
+        db = self._index_db(subdb)
+        ret = []
+        with self.index_dbs[subdb].begin() as txn:
+            cur = txn.cursor(db=db)
+            if cur.set_key(item.encode()):
+                for t in cur.iternext_dup():
+                    _, attr, pid = t.decode().split('\t')
+                    ret.append((attr, pid))
+        return ret
+
+    def get_many(self, items: Iterable[str]) -> List[Union[SeqRecord, None]]:
+        items = list(items)
+        found = self._get_compressed_many(items)
+        return [self._extract_seqrecord(found[item]) if item in found else None for item in items]
+
+    def _get_compressed_many(self, items: Iterable[str]) -> Dict[str, bytes]:
+        """
+        Fetches compressed records for many keys using one read transaction per touched split.
+        """
+        found = {}
+        by_subdb = defaultdict(list)
+        for item in set(items):
+            by_subdb[self._get_subdb(item)].append(item)
+        for subdb, keys in by_subdb.items():
+            with self.db[subdb].begin() as txn:
+                for key in keys:
+                    t = txn.get(key.encode())
+                    if t:
+                        found[key] = t
+        missing = [item for item in set(items) if item not in found]
+        if missing and self.has_index:
+            primary = self._resolve_many(missing)
+            by_subdb = defaultdict(list)
+            for item, pid in primary.items():
+                by_subdb[self._get_subdb(pid)].append((item, pid))
+            for subdb, pairs in by_subdb.items():
+                with self.db[subdb].begin() as txn:
+                    for item, pid in pairs:
+                        t = txn.get(pid.encode())
+                        if t:
+                            found[item] = t
+        return found
+
+    def _resolve_many(self, items: List[str]) -> Dict[str, str]:
+        """
+        Finds primary accessions for many secondary identifiers using one read transaction per index database.
+        """
+        primary = {}
+        attrs = ['alias'] if self.has_alias else [a for a in self.ids if a != '_id']
+        for attr in attrs:
+            by_subdb = defaultdict(list)
+            for item in items:
+                if item not in primary:
+                    by_subdb[attr + self._get_subdb(item, True)].append(item)
+            for subdb, keys in by_subdb.items():
+                db = self._index_db(subdb)
                 with self.index_dbs[subdb].begin() as txn:
-                    t = txn.get(item.encode())
-                if t:
-                    with self.db[self._get_subdb(t.decode())].begin() as txn:
-                        t = txn.get(t)
-                        break
-        if t is None:
-            return None
-        return self._extract_seqrecord(t)
+                    for key in keys:
+                        t = txn.get(key.encode(), db=db)
+                        if t:
+                            primary[key] = t.split(b'\t')[2].decode() if self.has_alias else t.decode()
+        return primary
 
     def get_iter(self) -> Generator[SeqRecord, None, None]:
         for i in range(self.db_splits):
@@ -120,6 +295,22 @@ class RawLMDBDatabase(BaseDatabase):
                 for entry in cursor.iternext(keys=False):
                     yield self._extract_seqrecord(entry)
 
+    def iter_raw(self) -> Generator[bytes, None, None]:
+        for i in range(self.db_splits):
+            with self.db[str(i)].begin(buffers=True) as txn:
+                cursor = txn.cursor()
+                for entry in cursor.iternext(keys=False):
+                    yield self.decompressor.decompress(entry)
+
+    def partitions(self) -> List[str]:
+        return [str(i) for i in range(self.db_splits)]
+
+    def _iter_partition(self, partition: str) -> Generator[bytes, None, None]:
+        with self.db[partition].begin() as txn:
+            cursor = txn.cursor()
+            for entry in cursor.iternext(keys=False):
+                yield entry
+
     def get_iterkeys(self) -> Generator[str, None, None]:
         for i in range(self.db_splits):
             with self.db[str(i)].begin() as txn:
@@ -144,8 +335,8 @@ class RawLMDBDatabase(BaseDatabase):
             return ret
         if self.has_index:
             subdb = attr + self._get_subdb(value, True)
+            db = self._index_db(subdb)
             with self.index_dbs[subdb].begin() as txn:
-                db = self.index_dbs[subdb].open_db(dupsort=True)
                 cur = txn.cursor(db=db)
                 if cur.set_key(value.encode()):
                     for i in cur.iternext_dup():
@@ -160,35 +351,103 @@ class RawLMDBDatabase(BaseDatabase):
         self._add_from_handles(handles, filter_fn=filter_fn, total=total, loud=loud)
 
     def add_protein(self, protein: dict) -> bool:
-        pid = protein['_id']
-        bpid = pid.encode()
-        with self.db[self._get_subdb(pid)].begin(write=True) as txn:
-            txn.put(bpid, protein['raw_record'])
-        if self.has_index:
-            for attr in self.indices:
-                if attr in protein:
-                    if isinstance(protein[attr], list):
-                        for idx in protein[attr]:
-                            subdb = attr + self._get_subdb(idx, True)
-                            with self.index_dbs[subdb].begin(write=True) as txn:
-                                db = self.index_dbs[subdb].open_db(dupsort=True)
-                                txn.put(idx.encode(), bpid, db=db)
-                    elif isinstance(protein[attr], str):
-                        subdb = attr + self._get_subdb(protein[attr], True)
-                        with self.index_dbs[subdb].begin(write=True) as txn:
-                            db = self.index_dbs[subdb].open_db(dupsort=True)
-                            txn.put(protein[attr].encode(), bpid, db=db)
-                    else:
-                        subdb = attr + self._get_subdb(str(protein[attr]), True)
-                        with self.index_dbs[subdb].begin(write=True) as txn:
-                            db = self.index_dbs[subdb].open_db(dupsort=True)
-                            txn.put(str(protein[attr]).encode(), bpid, db=db)
+        return self.add_proteins([protein])
+
+    def add_proteins(self, proteins: Iterable[dict]) -> bool:
+        """
+        Writes a batch of proteins using a single write transaction for each touched split and index database.
+        """
+        records = defaultdict(list)
+        index_entries = defaultdict(list)
+        for protein in proteins:
+            bpid = protein['_id'].encode()
+            records[self._get_subdb(protein['_id'])].append((bpid, protein['raw_record']))
+            if self.has_index:
+                for attr, value in self._index_values(protein):
+                    index_entries[attr + self._get_subdb(value, True)].append((value.encode(), bpid))
+                if self.has_alias:
+                    for key, value in self._alias_entries(protein):
+                        index_entries['alias' + self._get_subdb(key, True)].append((key.encode(), value))
+
+        for subdb, items in records.items():
+            with self.db[subdb].begin(write=True) as txn:
+                for key, value in items:
+                    txn.put(key, value)
+        for subdb, items in index_entries.items():
+            db = self._index_db(subdb)
+            with self.index_dbs[subdb].begin(write=True) as txn:
+                for key, value in items:
+                    txn.put(key, value, db=db)
 
         return True
 
+    def _index_values(self, protein: dict) -> Generator[Tuple[str, str], None, None]:
+        """
+        Yields (attribute, value) pairs for every indexed value of a protein.
+        """
+        for attr in self.indices:
+            if attr in protein:
+                if isinstance(protein[attr], list):
+                    for idx in protein[attr]:
+                        yield attr, idx
+                elif isinstance(protein[attr], str):
+                    yield attr, protein[attr]
+                else:
+                    yield attr, str(protein[attr])
+
+    def _alias_entries(self, protein: dict) -> Generator[Tuple[str, bytes], None, None]:
+        """
+        Yields (identifier, alias value) pairs for the alias index. Values sort by the priority of their
+        source attribute in self.ids, so the first duplicate is the one the old per-attribute lookups found.
+        """
+        bpid = protein['_id'].encode()
+        for rank, attr in enumerate(self.ids):
+            if attr == '_id' or attr not in protein:
+                continue
+            values = protein[attr]
+            if not isinstance(values, list):
+                values = [values]
+            for value in values:
+                yield str(value), b'%d\t%s\t%s' % (rank, attr.encode(), bpid)
+
+    def build_alias_index(self, loud: bool = False) -> None:
+        """
+        Builds the alias index for a database created without one from the existing per-attribute indices.
+        """
+        if not self.has_index:
+            raise ValueError('Alias index requires an indexed database')
+        self.has_alias = True
+        self._open_alias_dbs()
+        for rank, attr in enumerate(self.ids):
+            if attr == '_id':
+                continue
+            for i in tqdm(range(self.index_db_splits), disable=(not loud), desc=attr):
+                subdb = attr + str(i)
+                db = self._index_db(subdb)
+                entries = defaultdict(list)
+                with self.index_dbs[subdb].begin() as txn:
+                    for key, pid in txn.cursor(db=db).iternext():
+                        entries['alias' + self._get_subdb(key.decode(), True)].append(
+                            (key, b'%d\t%s\t%s' % (rank, attr.encode(), pid)))
+                for alias_subdb, items in entries.items():
+                    alias_db = self._index_db(alias_subdb)
+                    with self.index_dbs[alias_subdb].begin(write=True) as txn:
+                        for key, value in items:
+                            txn.put(key, value, db=alias_db)
+        self._write_db_info()
+
     def _add_from_handles(self, handles: Iterable[BinaryIO], filter_fn: Callable = None,
-                          total: int = None, loud: bool = False, fake: bool = False) -> None:
+                          total: int = None, loud: bool = False, fake: bool = False,
+                          batch_size: int = None) -> None:
+        if batch_size is None:
+            batch_size = self.batch_size
         raw_protein_records = itertools.chain(*[parse_raw_swiss(handle, filter_fn) for handle in handles])
+        batch = []
         for record in tqdm(raw_protein_records, disable=(not loud), total=total, smoothing=0.1):
             if not fake:
-                self.add_protein(self.create_protein_func(record))
+                batch.append(self.create_protein_func(record))
+                if len(batch) >= batch_size:
+                    self.add_proteins(batch)
+                    batch = []
+        if batch:
+            self.add_proteins(batch)
@@ -1,5 +1,5 @@
 import itertools
-from typing import Union, Iterable, Callable, Generator, List
+from typing import Union, Iterable, Callable, Generator, List, Tuple
 
 import pymongo
 from Bio.SeqRecord import SeqRecord
@@ -15,6 +15,8 @@ class MongoDatabase(BaseDatabase):
         super().__init__(database, host, **kwargs)
         self.client = pymongo.MongoClient(*host)
         self.col = self.client[database].proteins
+        self.metadata = self.client[database].metadata
+        self._load_compression()
 
     def get_item(self, item: str) -> Union[SeqRecord, None]:
         t = self.col.find_one({'$or': [{i: item} for i in self.ids]}, {'raw_record': True})
@@ -23,10 +25,50 @@ class MongoDatabase(BaseDatabase):
         r = self._extract_seqrecord(t['raw_record'])
         return r
 
+    def get_raw(self, item: str) -> Union[bytes, None]:
+        t = self.col.find_one({'$or': [{i: item} for i in self.ids]}, {'raw_record': True})
+        if t is None:
+            return None
+        return self.decompressor.decompress(t['raw_record'])
+
+    def get_many(self, items: Iterable[str], batch_size: int = 1000) -> List[Union[SeqRecord, None]]:
+        items = list(items)
+        found = {}
+        unique = list(set(items))
+        projection = {i: True for i in self.ids + ['raw_record']}
+        for start in range(0, len(unique), batch_size):
+            batch = unique[start:start + batch_size]
+            query = {'$or': [{i: {'$in': batch}} for i in self.ids]}
+            for entry in self.col.find(query, projection):
+                self._match_ids(entry, set(batch), found)
+        return [self._extract_seqrecord(found[item]['raw_record']) if item in found else None for item in items]
+
     def get_iter(self) -> Generator[SeqRecord, None, None]:
         for entry in self.col.find({}, {'raw_record': True}):
             yield self._extract_seqrecord(entry['raw_record'])
 
+    def iter_raw(self) -> Generator[bytes, None, None]:
+        for entry in self.col.find({}, {'raw_record': True}):
+            yield self.decompressor.decompress(entry['raw_record'])
+
+    def partitions(self, n: int = 16) -> List[Tuple[Union[str, None], Union[str, None]]]:
+        buckets = list(self.col.aggregate([{'$bucketAuto': {'groupBy': '$_id', 'buckets': n}}]))
+        bounds = [None] + [b['_id']['max'] for b in buckets[:-1]] + [None]
+        return list(zip(bounds[:-1], bounds[1:]))
+
+    def _partition_query(self, partition: Tuple[Union[str, None], Union[str, None]]) -> dict:
+        lower, upper = partition
+        query = {}
+        if lower is not None:
+            query['$gte'] = lower
+        if upper is not None:
+            query['$lt'] = upper
+        return {'_id': query} if query else {}
+
+    def _iter_partition(self, partition: Tuple[Union[str, None], Union[str, None]]) -> Generator[bytes, None, None]:
+        for entry in self.col.find(self._partition_query(partition), {'raw_record': True}):
+            yield entry['raw_record']
+
     def get_iterkeys(self) -> Generator[str, None, None]:
         for i in self.col.find({}, {'_id': True}):
             yield i['_id']
@@ -46,12 +88,23 @@ class MongoDatabase(BaseDatabase):
 
     def _reset(self) -> None:
         self.client[self.database].proteins.drop()
+        self.metadata.delete_one({'_id': 'compression'})
 
     def _create_indices(self, background: bool = False) -> None:
         for field in self.indices:
             self.client[self.database].proteins.create_index([(field, pymongo.ASCENDING)],
                                                              background=background, sparse=True)
 
+    def _fetch_compression(self) -> Union[Tuple[Union[bytes, None], int], None]:
+        info = self.metadata.find_one({'_id': 'compression'})
+        if info is None:
+            return None
+        return info['dict'], info['level']
+
+    def _store_compression(self, dict_data: Union[bytes, None], level: int) -> None:
+        self.metadata.replace_one({'_id': 'compression'}, {'_id': 'compression', 'dict': dict_data, 'level': level},
+                                  upsert=True)
+
     def update(self, handles: Iterable, filter_fn: Callable = None,
                loud: bool = False, total: int = None, workers: int = 1, fake: bool = False) -> None:
         raw_protein_records = itertools.chain(*[parse_raw_swiss(handle, filter_fn) for handle in handles])
@@ -0,0 +1,146 @@
+from io import StringIO as IOFunc
+from typing import Union, Tuple
+
+import zstd
+from Bio import SeqIO
+from Bio.Seq import Seq
+from Bio.SeqRecord import SeqRecord
+
+
+def _scan_fields(data: bytes) -> Tuple[str, str, str, int, str]:
+    """
+    Pulls the entry name, primary accession, description, taxid and sequence out of a SwissProt entry
+    without building a SeqRecord
+    """
+    desc_lines = []
+    seq_lines = []
+    taxid = -1
+    name = None
+    accession = None
+    start = 0
+    end = len(data)
+    while start < end:
+        stop = data.find(b'\n', start)
+        if stop == -1:
+            stop = end
+        s = data[start:start + 2]
+        if s == b'  ':
+            seq_lines.append(data[start:stop])
+        elif s == b'ID':
+            name = data[start:stop].split()[1].decode()
+        elif s == b'AC' and accession is None:
+            accession = data[start:stop].split()[1].rstrip(b';').decode()
+        elif s == b'DE':
+            desc_lines.append(data[start + 5:stop].strip())
+        elif s == b'OX' and taxid == -1:
+            taxid = int(data[start:stop].split(b'=')[1].split()[0].strip(b';'))
+        start = stop + 1
+    seq = b''.join(b''.join(seq_lines).split()).decode()
+    return name, accession, b' '.join(desc_lines).decode(), taxid, seq
+
+
+def raw_to_fasta(data: bytes, width: int = 60) -> bytes:
+    """
+    Converts a decompressed SwissProt entry to a FASTA record matching Biopython's FASTA output
+    """
+    name, accession, description, taxid, seq = _scan_fields(data)
+    lines = [f'>{accession} {description}'.encode()]
+    seq = seq.encode()
+    for i in range(0, len(seq), width):
+        lines.append(seq[i:i + width])
+    lines.append(b'')
+    return b'\n'.join(lines)
+
+
+class LazyRecord(object):
+    """
+    Lightweight stand-in for a SeqRecord built from a stored (compressed) SwissProt entry.
+
+    The accession, entry name, description, taxid and sequence are pulled straight from the flatfile
+    bytes on first access. The full Biopython SeqRecord is only parsed when `record` is requested or
+    an attribute only it provides (features, annotations, ...) is accessed.
+    """
+    __slots__ = ('_raw', '_decompressor', '_data', '_id', '_name', '_description', '_taxid', '_seq', '_record')
+
+    def __init__(self, raw_record: bytes, decompressor: Union[zstd.ZstdDecompressor, None] = None):
+        self._raw = raw_record
+        self._decompressor = decompressor
+        self._data = None
+        self._id = None
+        self._name = None
+        self._description = None
+        self._taxid = None
+        self._seq = None
+        self._record = None
+
+    @property
+    def raw(self) -> bytes:
+        """
+        Decompressed SwissProt flatfile entry
+        """
+        if self._data is None:
+            if self._decompressor is None:
+                self._data = self._raw
+            else:
+                self._data = self._decompressor.decompress(self._raw)
+            self._raw = None
+        return self._data
+
+    def _parse(self) -> None:
+        self._name, self._id, self._description, self._taxid, self._seq = _scan_fields(self.raw)
+
+    @property
+    def id(self) -> str:
+        if self._id is None:
+            self._parse()
+        return self._id
+
+    @property
+    def name(self) -> str:
+        if self._id is None:
+            self._parse()
+        return self._name
+
+    @property
+    def description(self) -> str:
+        if self._id is None:
+            self._parse()
+        return self._description
+
+    @property
+    def taxid(self) -> int:
+        if self._id is None:
+            self._parse()
+        return self._taxid
+
+    @property
+    def seq(self) -> Seq:
+        if self._id is None:
+            self._parse()
+        return Seq(self._seq)
+
+    @property
+    def record(self) -> SeqRecord:
+        """
+        Fully parsed Biopython SeqRecord
+        """
+        if self._record is None:
+            self._record = SeqIO.read(IOFunc(self.raw.decode()), 'swiss')
+        return self._record
+
+    def __getattr__(self, item: str):
+        if item.startswith('_'):
+            raise AttributeError(item)
+        return getattr(self.record, item)
+
+    def __reduce__(self):
+        # Decompressors can't be pickled, so ship the decompressed entry instead
+        return LazyRecord, (self.raw,)
+
+    def __len__(self) -> int:
+        if self._id is None:
+            self._parse()
+        return len(self._seq)
+
+    def __repr__(self) -> str:
+        return f'LazyRecord(id={self.id!r}, name={self.name!r})'
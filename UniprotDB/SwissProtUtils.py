@@ -15,6 +15,32 @@ def _get_record(handle: BinaryIO, ignore: Collection[bytes] = (b'R', b'C')):
             lines = []
 
 
+def _get_record_buffered(handle: BinaryIO, buffer_size: int = 2 ** 22):
+    """
+    Returns the next complete SwissProt entry in the input handle, matching _get_record but reading
+    large buffers and finding entry boundaries with bulk searches instead of iterating over lines.
+    """
+    pending = b''
+    eof = False
+    while not eof:
+        chunk = handle.read(buffer_size)
+        eof = not chunk
+        data = pending + chunk if pending else chunk
+        start = 0
+        while True:
+            end = data.find(b'\n//', start)
+            if end == -1:
+                break
+            stop = data.find(b'\n', end + 3)
+            if stop == -1:
+                if not eof:
+                    break
+                stop = len(data) - 1
+            yield data[start:stop + 1]
+            start = stop + 1
+        pending = data[start:]
+
+
 def filter_proks(record: bytes):
     """
     Example filter function which returns True only for prokaryotes
@@ -36,8 +62,8 @@ def parse_raw_swiss(handle: BinaryIO, filter_fn: Callable[[bytes], bool] = None)
     in the iterator, if False it is not.
     """
     if not filter_fn:
-        def filter_fn(*args):
-            return True
-    for res in _get_record(handle):
+        yield from _get_record_buffered(handle)
+        return
+    for res in _get_record_buffered(handle):
         if filter_fn(res):
             yield res
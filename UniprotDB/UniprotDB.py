@@ -36,7 +36,8 @@ class SeqDB(collections.abc.Mapping):
     def __init__(self, database: str = 'uniprot',
                  host: Union[str, tuple] = '',
                  dbtype: str = 'lmdb',
-                 on_demand: bool = False, **kwargs):
+                 on_demand: bool = False,
+                 lazy: bool = False, **kwargs):
         if dbtype == 'mongo':
             if HAS_MONGO:
                 from UniprotDB.MongoDB import MongoDatabase as BaseDB
@@ -52,11 +53,15 @@ class SeqDB(collections.abc.Mapping):
         else:
             raise ValueError(f'BaseDB: {dbtype} not known')
         if host:
-            self.db = BaseDB(database, host, **kwargs)
+            self.db = BaseDB(database, host, lazy=lazy, **kwargs)
         else:
-            self.db = BaseDB(database, **kwargs)
+            self.db = BaseDB(database, lazy=lazy, **kwargs)
         self.database = database
+        self.host = host
+        self.dbtype = dbtype
         self.on_demand = on_demand
+        self.lazy = lazy
+        self._kwargs = kwargs
 
     def initialize(self, flatfiles: Iterable, *args, **kwargs) -> None:
         self.db.initialize(flatfiles, *args, **kwargs)
@@ -71,9 +76,64 @@ class SeqDB(collections.abc.Mapping):
                     break
         return r
 
+    def get_raw(self, item: str) -> Union[bytes, None]:
+        return self.db.get_raw(item)
+
+    def iter_raw(self) -> Generator[bytes, None, None]:
+        return self.db.iter_raw()
+
+    def iter_fasta(self) -> Generator[bytes, None, None]:
+        return self.db.iter_fasta()
+
+    def get_many(self, items: Iterable[str]) -> List[Union[SeqRecord, None]]:
+        items = list(items)
+        records = self.db.get_many(items)
+        if self.on_demand:
+            records = [r if r else self[item] for item, r in zip(items, records)]
+        return records
+
     def __iter__(self) -> Generator[SeqRecord, None, None]:
         return self.db.get_iter()
 
+    def parallel_iter(self, workers: int = 4, ordered: bool = False, fn: Callable = None,
+                      batch_size: int = 1000) -> Generator:
+        """
+        Iterates over the whole database using a pool of worker processes, one partition of the database at a time.
+        Each worker opens its own connection to the database and, if given, applies fn to every record before
+        sending the results back.
+        :param workers: number of worker processes
+        :param ordered: whether to yield results in partition order (buffers finished partitions in memory)
+        :param fn: optional picklable function applied to every record inside the workers
+        :param batch_size: number of results sent back from a worker at once
+        :return: generator of records (or results of fn)
+        """
+        from multiprocessing import get_context
+
+        partitions = self.db.partitions()
+        mp_context = get_context('spawn')
+        queue = mp_context.Queue(maxsize=workers * 4)
+        db_args = (self.database, self.host, self.dbtype, self.lazy, self._kwargs)
+        with mp_context.Pool(workers, initializer=_init_partition_worker, initargs=(queue,)) as p:
+            for i, partition in enumerate(partitions):
+                p.apply_async(_partition_worker, (db_args, i, partition, fn, batch_size),
+                              error_callback=lambda e, i=i: queue.put((i, e)))
+            buffered = {}
+            finished = set()
+            next_partition = 0
+            while len(finished) < len(partitions):
+                i, batch = queue.get()
+                if isinstance(batch, Exception):
+                    raise batch
+                if batch is None:
+                    finished.add(i)
+                elif ordered and i != next_partition:
+                    buffered.setdefault(i, []).extend(batch)
+                else:
+                    yield from batch
+                while ordered and next_partition in finished:
+                    next_partition += 1
+                    yield from buffered.pop(next_partition, [])
+
     def iterkeys(self) -> Generator[str, None, None]:
         return self.db.get_iterkeys()
 
@@ -123,6 +183,34 @@ class SeqDB(collections.abc.Mapping):
         trembl.close()
 
 
+_partition_queue = None
+
+
+def _init_partition_worker(queue) -> None:
+    global _partition_queue
+    _partition_queue = queue
+
+
+def _partition_worker(db_args: tuple, i: int, partition, fn: Callable, batch_size: int) -> None:
+    """
+    Iterates over one partition of a SeqDB inside a worker process, sending batches of results to the parent
+    """
+    database, host, dbtype, lazy, kwargs = db_args
+    try:
+        db = SeqDB(database, host, dbtype, lazy=lazy, **kwargs)
+        batch = []
+        for record in db.db.iter_partition(partition):
+            batch.append(fn(record) if fn else record)
+            if len(batch) >= batch_size:
+                _partition_queue.put((i, batch))
+                batch = []
+        if batch:
+            _partition_queue.put((i, batch))
+        _partition_queue.put((i, None))
+    except Exception as e:
+        _partition_queue.put((i, e))
+
+
 def create_index(flatfiles: Iterable, host: Union[str, tuple] = (),
                  dbtype: str = 'lmdb', n_jobs: int = 1, **kwargs) -> SeqDB:
     """
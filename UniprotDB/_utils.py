@@ -1,8 +1,9 @@
 import hashlib
+import re
 from collections import defaultdict
 from datetime import datetime
 from io import StringIO as IOFunc
-from typing import Generator
+from typing import Generator, List
 
 import requests
 import zstd
@@ -16,15 +17,17 @@ uniparc_s_req = 'http://www.uniprot.org/uniparc/?query={}&format=list'
 uniparc_f_req = 'http://www.uniprot.org/uniparc/{}.xml'
 
 
+_months = {
+    'JAN': 1, 'FEB': 2, 'MAR': 3,
+    'APR': 4, 'MAY': 5, 'JUN': 6,
+    'JUL': 7, 'AUG': 8, 'SEP': 9,
+    'OCT': 10, 'NOV': 11, 'DEC': 12,
+}
+
+
 def _get_date(dateline: str) -> datetime:
-    months = {
-        'JAN': 1, 'FEB': 2, 'MAR': 3,
-        'APR': 4, 'MAY': 5, 'JUN': 6,
-        'JUL': 7, 'AUG': 8, 'SEP': 9,
-        'OCT': 10, 'NOV': 11, 'DEC': 12,
-    }
     day, month, year = dateline.split()[1].strip(',').split('-')
-    return datetime(int(year), months[month], int(day))
+    return datetime(int(year), _months[month], int(day))
 
 
 def _create_protein_swiss(raw_record: bytes, compressor: zstd.ZstdCompressor) -> dict:
@@ -72,6 +75,68 @@ def _create_protein_swiss(raw_record: bytes, compressor: zstd.ZstdCompressor) ->
     )
 
 
+def _get_date_bytes(date: bytes) -> datetime:
+    day, month, year = date.strip(b',').split(b'-')
+    return datetime(int(year), _months[month.decode()], int(day))
+
+
+_block_ends = {tag: re.compile(b'\n(?!' + tag + b')') for tag in (b'DT', b'DE', b'OS', b'OX', b'DR')}
+
+
+def _get_block(raw_record: bytes, tag: bytes) -> bytes:
+    """
+    Returns the contiguous run of lines starting with the given tag (SwissProt keeps each line type together)
+    """
+    start = raw_record.find(b'\n' + tag)
+    if start == -1:
+        return b''
+    end = _block_ends[tag].search(raw_record, start + 1)
+    if end is None:
+        return raw_record[start + 1:]
+    return raw_record[start + 1:end.end()]
+
+
+def _block_lines(block: bytes) -> List[bytes]:
+    return [line[2:].lstrip() for line in block.splitlines()]
+
+
+def _create_protein_swiss_bytes(raw_record: bytes, compressor: zstd.ZstdCompressor) -> dict:
+    """
+    Produces the same protein dict as _create_protein_swiss, but locates each line block with bulk
+    searches over the raw bytes instead of decoding and testing every line.
+    """
+    first = raw_record.find(b'\n')
+    second = raw_record.find(b'\n', first + 1)
+
+    refs = defaultdict(list)
+    for ref in _get_block(raw_record, b'DR').decode().split('\n'):
+        dec = ref[2:].lstrip().strip('.').split(';', 2)
+        if len(dec) > 1:
+            refs[dec[0]].append(dec[1].strip())
+
+    seq = b''
+    sq = raw_record.find(b'\nSQ')
+    if sq != -1:
+        seq_start = raw_record.find(b'\n', sq + 1)
+        seq_end = raw_record.find(b'\n//', seq_start)
+        seq = b''.join(raw_record[seq_start:seq_end].split())
+
+    taxid = _block_lines(_get_block(raw_record, b'OX'))
+    dates = _block_lines(_get_block(raw_record, b'DT'))
+
+    return dict(
+        _id=raw_record[first:second].split()[1].strip(b';').decode(),
+        genome=''.join(g.strip(b'. ').decode() for g in _block_lines(_get_block(raw_record, b'OS'))),
+        taxid=int(taxid[-1].split(b'=')[1].split()[0].strip(b';')) if taxid else -1,
+        description=b' '.join(_block_lines(_get_block(raw_record, b'DE'))).decode(),
+        updated=_get_date_bytes(dates[-1].split()[0]),
+        raw_record=compressor.compress(raw_record),
+        seq_sha1=hashlib.sha1(seq).hexdigest(),
+        Uni_name=[raw_record[:first].split()[1].decode()],
+        **refs,
+    )
+
+
 def _extract_seqrecord(raw_record: bytes, decompressor: zstd.ZstdDecompressor) -> SeqRecord:
     return SeqIO.read(IOFunc(decompressor.decompress(raw_record).decode()), 'swiss')
 
@@ -0,0 +1,76 @@
+import logging
+from typing import BinaryIO, Union
+
+from UniprotDB.UniprotDB import SeqDB
+
+
+def open_output(filename: str) -> Union[BinaryIO, None]:
+    """
+    Opens the output filename as a binary write handle depending on compression
+    :param filename: String filename ending in .dat, .fasta or .fa, optionally followed by .zst
+    :return: Binary handle
+    """
+    if filename.endswith('.zst'):
+        import zstd
+        cctx = zstd.ZstdCompressor(threads=-1)
+        return cctx.stream_writer(open(filename, 'wb'))
+    return open(filename, 'wb')
+
+
+def export(seqdb: SeqDB, filename: str, fmt: str = None, buffer_size: int = 2 ** 20) -> int:
+    """
+    Streams every entry of a SeqDB to a SwissProt flatfile or FASTA file without parsing with Biopython
+    :param seqdb: SeqDB to export
+    :param filename: output filename, compressed with zstd if it ends with .zst
+    :param fmt: 'dat' or 'fasta', guessed from the filename if not given
+    :param buffer_size: number of bytes to collect before each write
+    :return: number of entries written
+    """
+    if fmt is None:
+        base = filename[:-4] if filename.endswith('.zst') else filename
+        fmt = 'fasta' if base.endswith('.fasta') or base.endswith('.fa') else 'dat'
+    if fmt == 'dat':
+        entries = seqdb.iter_raw()
+    elif fmt == 'fasta':
+        entries = seqdb.iter_fasta()
+    else:
+        raise ValueError(f'Export format: {fmt} not known')
+
+    count = 0
+    with open_output(filename) as out:
+        buffer = []
+        buffered = 0
+        for entry in entries:
+            if not entry.endswith(b'\n'):
+                entry += b'\n'
+            buffer.append(entry)
+            buffered += len(entry)
+            count += 1
+            if buffered >= buffer_size:
+                out.write(b''.join(buffer))
+                buffer = []
+                buffered = 0
+        out.write(b''.join(buffer))
+    return count
+
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Export a SeqDB to a Uniprot flatfile or FASTA file')
+    parser.add_argument('output', type=str, help='Output file (.dat or .fasta, optionally with .zst)')
+    parser.add_argument('-l', '--location', default='~/.seqdb', help='Location of the database (hostname or filename)')
+    parser.add_argument('-t', '--type', default='lmdb', help='Database type to utilize')
+    parser.add_argument('-f', '--format', default=None, choices=['dat', 'fasta'],
+                        help='Output format (guessed from the output filename by default)')
+
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+
+    count = export(SeqDB(host=args.location, dbtype=args.type), args.output, args.format)
+    logging.info(f'Exported {count} entries to {args.output}')
+
+
+if __name__ == '__main__':
+    main()
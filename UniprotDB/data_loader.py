@@ -6,6 +6,7 @@ import traceback
 from io import BufferedReader
 from typing import Iterable, Union, BinaryIO, Tuple, Generator, List
 
+from UniprotDB.SwissProtUtils import parse_raw_swiss
 from UniprotDB.UniprotDB import SeqDB
 
 
@@ -123,13 +124,19 @@ def main():
     parser.add_argument('--no-index', action='store_false', help='Skip metadata indexing')
     parser.add_argument('--lmdb-db-splits', default=10, type=int, help='How many databases to split main database to')
     parser.add_argument('--lmdb-index-splits', default=10, type=int, help='How many databases to split index databases')
+    parser.add_argument('--train-dict', action='store_true',
+                        help='Train a zstd dictionary from the first input file (with --initialize)')
+    parser.add_argument('--dict-samples', default=10000, type=int, help='Number of entries to train the dictionary on')
+    parser.add_argument('--lmdb-batch-size', default=1000, type=int, help='How many entries to write per transaction')
 
     args = parser.parse_args()
 
     logging.basicConfig(filename='data_loader.log', level=logging.DEBUG if args.debug else logging.INFO)
 
     process_main(args.dats, args.location, args.type, args.initialize, args.verbose, args.jobs, args.num_seqs,
-                 db_splits=args.lmdb_db_splits, index_db_splits=args.lmdb_index_splits, index=args.no_index)
+                 train_dict=args.train_dict, dict_samples=args.dict_samples,
+                 db_splits=args.lmdb_db_splits, index_db_splits=args.lmdb_index_splits, index=args.no_index,
+                 batch_size=args.lmdb_batch_size)
 
 
 def process_main(dats: Iterable[str],
@@ -139,6 +146,8 @@ def process_main(dats: Iterable[str],
                  verbose: bool = True,
                  n_jobs: int = 8,
                  num_seqs: int = 0,
+                 train_dict: bool = False,
+                 dict_samples: int = 10000,
                  **kwargs) -> SeqDB:
     """
     Main function for parallel data loading into a SeqDB.
@@ -149,6 +158,8 @@ def process_main(dats: Iterable[str],
     :param verbose: bool Whether to show a progress bar
     :param n_jobs: number of parallel processes to use
     :param num_seqs: cosmetic number of input sequences for progress bar
+    :param train_dict: bool Whether to train a zstd dictionary from the first input (requires initialize)
+    :param dict_samples: number of entries from the first input to train the dictionary on
     :param kwargs: dictionary with extra parameters for SeqDB
     :return: SeqDB object with the resulting data
     """
@@ -159,6 +170,12 @@ def process_main(dats: Iterable[str],
     if initialize:
         logging.debug('Initializing db')
         seqdb.initialize([], loud=False)
+        if train_dict:
+            logging.debug('Training compression dictionary')
+            dats = list(dats)
+            with open_dat(dats[0]) as fh:
+                samples = list(itertools.islice(parse_raw_swiss(fh), dict_samples))
+            seqdb.db.train_compression(samples)
 
     if verbose:
         from tqdm import tqdm
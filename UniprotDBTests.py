@@ -1,4 +1,5 @@
 import gzip
+import itertools
 import os
 import unittest
 
@@ -21,6 +22,14 @@ from UniprotDB.SwissProtUtils import filter_proks
 ondemand = bool(os.environ.get('TEST_INTERNET'))
 
 
+def _record_length(record):
+    return len(record.seq)
+
+
+def _record_id(record):
+    return record.id
+
+
 class SeqDBTest(object):
     def test_get(self):
         self.assertEqual(self.db.get('Q92AT0').id, 'Q92AT0')
@@ -55,6 +64,35 @@ class SeqDBTest(object):
         self.assertEqual(self.db.get_by('_id', 'Q92AT0')[0].id, "Q92AT0")
         self.assertEqual(self.db.get_by('Uni_name', '12OLP_LISIN')[0].id, "Q92AT0")
 
+    def test_get_secondary(self):
+        self.assertEqual(self.db.get('WP_010990982.1').id, 'Q92AT0')
+        self.assertEqual(self.db.get('12OLP_LISIN').id, 'Q92AT0')
+
+    def test_get_many(self):
+        records = self.db.get_many(['Q92AT0', 'MISSING', 'WP_010990982.1', 'Q92AT0'])
+        self.assertEqual([r.id if r else None for r in records], ['Q92AT0', None, 'Q92AT0', 'Q92AT0'])
+
+    def test_get_raw(self):
+        raw_record = self.db.get_raw('Q92AT0')
+        self.assertTrue(raw_record.startswith(b'ID   12OLP_LISIN'))
+        self.assertTrue(raw_record.rstrip().endswith(b'//'))
+        self.assertIsNone(self.db.get_raw('MISSING'))
+
+    def test_iter_raw(self):
+        self.assertTrue(next(self.db.iter_raw()).startswith(b'ID   '))
+
+    def test_iter_fasta(self):
+        from Bio import SeqIO
+        from io import StringIO
+        fasta = next(self.db.iter_fasta()).decode()
+        record = SeqIO.read(StringIO(fasta), 'fasta')
+        self.assertEqual(record.id, 'Q92AT0')
+        self.assertEqual(str(record.seq), str(self.db['Q92AT0'].seq))
+
+    def test_parallel_iter(self):
+        self.assertEqual([r.id for r in self.db.parallel_iter(workers=2)], ['Q92AT0'])
+        self.assertEqual(list(self.db.parallel_iter(workers=2, ordered=True, fn=_record_length)), [1086])
+
     def test_fetch(self):
         self.assertEqual(self.db.get('Q92AT0').id, 'Q92AT0')
 
@@ -120,6 +158,58 @@ class LMDBTest(unittest.TestCase, SeqDBTest):
                                          database=self.database,
                                          dbtype='lmdb', map_size=int(1024 * 1024 * 1024))
 
+    def test_update_batched(self):
+        with gzip.open('TestFiles/testbig.dat.gz', 'rb') as h:
+            self.db.db._add_from_handles([h], batch_size=7)
+        with gzip.open('TestFiles/testbig.dat.gz', 'rb') as h:
+            names = set(line.split()[1].decode() for line in h if line.startswith(b'ID'))
+        self.assertTrue(names.issubset(set(e.name for e in self.db)))
+        self.assertEqual(self.db.get_by('RefSeq', 'WP_010990982.1')[0].id, "Q92AT0")
+
+    def test_trained_dictionary(self):
+        with gzip.open('TestFiles/testbig.dat.gz', 'rb') as h:
+            self.db.initialize([h], train_dict=True, dict_samples=500, dict_size=2 ** 14)
+        self.assertIsNotNone(self.db.db.compression_dict)
+        self.assertEqual(self.db.get('Q6GZQ5').id, 'Q6GZQ5')
+        self.assertEqual(self.db.db._fetch_compression(), (self.db.db.compression_dict, 3))
+        self.assertEqual(len(list(self.db)), len(self.db))
+
+    def test_parallel_iter_ordered(self):
+        with gzip.open('TestFiles/testbig.dat.gz', 'rb') as h:
+            self.db.update([h])
+        self.assertEqual(list(self.db.parallel_iter(workers=3, ordered=True, fn=_record_id, batch_size=50)),
+                         list(self.db.iterkeys()))
+
+    def test_alias_index(self):
+        self.assertTrue(self.db.db.has_alias)
+        self.assertEqual(self.db.db.resolve_alias('WP_010990982.1'), [('RefSeq', 'Q92AT0')])
+        self.assertEqual(self.db.db.resolve_alias('12OLP_LISIN'), [('Uni_name', 'Q92AT0')])
+        self.assertEqual(self.db.db.resolve_alias('MISSING'), [])
+
+    def test_build_alias_index(self):
+        for i in range(self.db.db.index_db_splits):
+            subdb = 'alias' + str(i)
+            with self.db.db.index_dbs[subdb].begin(write=True) as txn:
+                txn.drop(self.db.db._index_db(subdb), delete=False)
+        self.db.db.has_alias = False
+        self.assertEqual(self.db.get('WP_010990982.1').id, 'Q92AT0')
+        self.db.db.build_alias_index()
+        self.assertEqual(self.db.db.resolve_alias('WP_010990982.1'), [('RefSeq', 'Q92AT0')])
+        self.assertEqual(self.db.get('WP_010990982.1').id, 'Q92AT0')
+
+    def test_export(self):
+        import tempfile
+        import zstd
+        from Bio import SeqIO
+        from io import StringIO
+        from UniprotDB.data_exporter import export
+        with tempfile.TemporaryDirectory() as directory:
+            filename = os.path.join(directory, 'export.fasta.zst')
+            self.assertEqual(export(self.db, filename), 1)
+            with open(filename, 'rb') as h:
+                fasta = zstd.ZstdDecompressor().stream_reader(h).read().decode()
+        self.assertEqual(SeqIO.read(StringIO(fasta), 'fasta').id, 'Q92AT0')
+
     def tearDown(self):
         import shutil
         for env in self.db.db.db.values():
@@ -129,5 +219,52 @@ class LMDBTest(unittest.TestCase, SeqDBTest):
         shutil.rmtree('seqdb_test')
 
 
+class ParserTest(unittest.TestCase):
+
+    def setUp(self):
+        with gzip.open('TestFiles/testbig.dat.gz', 'rb') as h:
+            self.data = h.read()
+
+    def test_split_records(self):
+        from io import BytesIO
+        from UniprotDB.SwissProtUtils import _get_record, _get_record_buffered
+        expected = list(_get_record(BytesIO(self.data)))
+        for buffer_size in (100, 4096, 2 ** 22):
+            self.assertEqual(list(_get_record_buffered(BytesIO(self.data), buffer_size=buffer_size)), expected)
+        self.assertEqual(list(_get_record_buffered(BytesIO(self.data.rstrip()))),
+                         list(_get_record(BytesIO(self.data.rstrip()))))
+
+    def test_create_protein(self):
+        import zstd
+        from io import BytesIO
+        from UniprotDB.SwissProtUtils import _get_record
+        from UniprotDB._utils import _create_protein_swiss, _create_protein_swiss_bytes
+        compressor = zstd.ZstdCompressor()
+        for raw_record in _get_record(BytesIO(self.data)):
+            self.assertEqual(_create_protein_swiss_bytes(raw_record, compressor),
+                             _create_protein_swiss(raw_record, compressor))
+
+
+class LazyRecordTest(unittest.TestCase):
+
+    def test_matches_seqrecord(self):
+        import zstd
+        from UniprotDB.Records import LazyRecord
+        from UniprotDB.SwissProtUtils import parse_raw_swiss
+        from UniprotDB._utils import _extract_seqrecord
+        compressor, decompressor = zstd.ZstdCompressor(), zstd.ZstdDecompressor()
+        with gzip.open('TestFiles/testbig.dat.gz', 'rb') as h:
+            for raw_record in itertools.islice(parse_raw_swiss(h), 100):
+                compressed = compressor.compress(raw_record)
+                full = _extract_seqrecord(compressed, decompressor)
+                lazy = LazyRecord(compressed, decompressor)
+                self.assertEqual(lazy.id, full.id)
+                self.assertEqual(lazy.name, full.name)
+                self.assertEqual(lazy.description, full.description)
+                self.assertEqual(str(lazy.seq), str(full.seq))
+                self.assertEqual(str(lazy.taxid), full.annotations['ncbi_taxid'][0])
+                self.assertEqual(len(lazy.features), len(full.features))
+
+
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,49 @@
+"""
+Compares the line-based and bytes-native SwissProt parsers (record splitting and protein dict creation)
+in records per second.
+
+    python benchmarks/parser_benchmark.py [TestFiles/testbig.dat.gz] [repeats]
+"""
+import gzip
+import io
+import sys
+import time
+
+import zstd
+
+from UniprotDB.SwissProtUtils import _get_record, _get_record_buffered
+from UniprotDB._utils import _create_protein_swiss, _create_protein_swiss_bytes
+
+
+def best_rate(fn, n_records: int, repeats: int) -> float:
+    best = float('inf')
+    for _ in range(repeats):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return n_records / best
+
+
+def main():
+    filename = sys.argv[1] if len(sys.argv) > 1 else 'TestFiles/testbig.dat.gz'
+    repeats = int(sys.argv[2]) if len(sys.argv) > 2 else 5
+    with gzip.open(filename, 'rb') as h:
+        data = h.read()
+    records = list(_get_record_buffered(io.BytesIO(data)))
+    compressor = zstd.ZstdCompressor()
+
+    print(f'{len(records)} records, {len(data) / 1e6:.1f} MB')
+    for name, splitter in (('line-based', _get_record), ('bytes-native', _get_record_buffered)):
+        rate = best_rate(lambda: list(splitter(io.BytesIO(data))), len(records), repeats)
+        print(f'split  {name:>12}: {rate:10.0f} records/s {rate * len(data) / len(records) / 1e6:8.1f} MB/s')
+    for name, parser in (('line-based', _create_protein_swiss), ('bytes-native', _create_protein_swiss_bytes)):
+        rate = best_rate(lambda: [parser(r, compressor) for r in records], len(records), repeats)
+        print(f'parse  {name:>12}: {rate:10.0f} records/s')
+    for name, splitter, parser in (('line-based', _get_record, _create_protein_swiss),
+                                   ('bytes-native', _get_record_buffered, _create_protein_swiss_bytes)):
+        rate = best_rate(lambda: [parser(r, compressor) for r in splitter(io.BytesIO(data))], len(records), repeats)
+        print(f'total  {name:>12}: {rate:10.0f} records/s')
+
+
+if __name__ == '__main__':
+    main()
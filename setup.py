@@ -99,6 +99,7 @@ setup(
     entry_points={
         'console_scripts': [
             'seqdb-load=UniprotDB.data_loader:main',
+            'seqdb-export=UniprotDB.data_exporter:main',
         ],
     },
 )